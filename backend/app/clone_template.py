@@ -0,0 +1,91 @@
+import html
+from typing import Dict, Optional
+from lxml import html as lxml_html
+
+# Pages whose HTML is smaller than this are candidates for cloning from
+# _CLONE_TEMPLATE instead of going through Gemini
+TEMPLATE_MAX_HTML = 2048
+
+# <script> types that carry data rather than code and do not make a page
+# script-dependent
+_DATA_SCRIPT_TYPES = frozenset({'application/ld+json', 'application/json'})
+
+_CLONE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+{css}
+</head>
+<body>
+{body}
+</body>
+</html>"""
+
+
+def generate_clone_from_template(context: Dict) -> Optional[str]:
+    """
+    Generate HTML clone by wrapping the scraped <body> in a static template.
+
+    Only trivial pages qualify: small, static and with visible text in the
+    body. Anything else (e.g. an SPA shell that renders from a script) returns
+    None so the caller falls through to Gemini.
+
+    Args:
+        context (Dict): Dictionary containing the page URL, HTML content and CSS links
+
+    Returns:
+        Optional[str]: Generated HTML code, or None if the page is not trivial
+    """
+    if len(context['html']) >= TEMPLATE_MAX_HTML:
+        return None
+
+    doc = lxml_html.document_fromstring(context['html'])
+    for script in list(doc.iter('script')):
+        if script.get('type', '').lower() not in _DATA_SCRIPT_TYPES:
+            return None
+        script.drop_tree()
+
+    # Inline event handlers and javascript: URLs are script too; the clone
+    # must be JavaScript-free, matching the Gemini prompt
+    if doc.xpath('//@*[starts-with(name(), "on")]'):
+        return None
+    for _, _, link, _ in doc.iterlinks():
+        if link.strip().lower().startswith('javascript:'):
+            return None
+
+    body = doc.find('body')
+    if body is None or not body.text_content().strip():
+        return None
+
+    # Stylesheet links are emitted in the template head from css_links, which
+    # already includes any found in <body>
+    for link in list(body.iter('link')):
+        if 'stylesheet' in link.get('rel', '').lower().split():
+            link.drop_tree()
+
+    # Absolute URLs so images and links still resolve when the clone is
+    # served from another origin
+    try:
+        doc.make_links_absolute(context['url'])
+    except ValueError:
+        # Malformed href (e.g. a broken IPv6 host); let Gemini handle the page
+        return None
+
+    css = [f'    <link rel="stylesheet" href="{html.escape(href)}">'
+           for href in context['css_links']]
+    head = doc.find('head')
+    if head is not None:
+        css += ["    " + lxml_html.tostring(style, encoding='unicode').strip()
+                for style in head.iter('style')]
+
+    # .text is already entity-decoded, so it has to be re-escaped; children
+    # and their tails are escaped by tostring
+    inner = html.escape(body.text or '', quote=False) + ''.join(
+        lxml_html.tostring(child, encoding='unicode') for child in body)
+
+    return _CLONE_TEMPLATE.format(
+        title=html.escape(doc.findtext('.//title') or ''),
+        css='\n'.join(css),
+        body=inner.strip()
+    )
@@ -1,7 +1,8 @@
 import os
-import requests
+import asyncio
+import httpx
+import orjson
 import logging
-import json
 from typing import Dict
 from dotenv import load_dotenv
 from pathlib import Path
@@ -38,12 +39,47 @@ Example output format:
 </html>
 """
 
+# Static prompt pieces wrapped around the per-request context
+_PROMPT_PREFIX = prompt_template + "\n\nHTML Content:\n"
+_PROMPT_SUFFIX = """
+Please generate a clean, modern HTML clone of this website. Focus on:
+1. Maintaining the same visual structure and layout
+2. Using modern HTML5 semantic elements
+3. Implementing responsive design
+4. Optimizing for performance
+5. Following accessibility best practices
+
+Remember: Return ONLY the HTML code, starting with <!DOCTYPE html>. Do not include any explanations or markdown formatting."""
+
 # Load .env from the backend directory
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(env_path)
 
+# Resolved once at import; the key does not change while the app is running
+_API_KEY = os.getenv("GEMINI_API_KEY")
+_ENDPOINT = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={_API_KEY}" if _API_KEY else None
+
+# Shared client so the TLS connection to the Gemini API is kept alive
+# and reused across requests
+_client = httpx.AsyncClient(
+    http2=True,
+    timeout=60,  # 60 second timeout
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+)
+
+
+# Caps in-flight Gemini calls to stay within the per-key rate limit; the
+# allowed calls are multiplexed as HTTP/2 streams over the shared client
+GEMINI_MAX_CONCURRENCY = 10
+_gemini_sem = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
 
-def generate_clone_from_context(context: Dict) -> str:
+async def close_client() -> None:
+    """Close the shared HTTP client. Call on application shutdown."""
+    await _client.aclose()
+
+
+async def generate_clone_from_context(context: Dict) -> str:
     """
     Generate HTML clone from the provided context using Gemini 2.0 Flash via HTTP API.
 
@@ -55,35 +91,30 @@ def generate_clone_from_context(context: Dict) -> str:
 
     Raises:
         ValueError: If API key is not set or request fails
-        requests.exceptions.RequestException: If API request fails
+        httpx.HTTPError: If API request fails
     """
-    # Get API key from environment
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    if not _API_KEY:
         raise ValueError("GEMINI_API_KEY environment variable is not set")
 
-    endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-
-    # Construct the prompt
-    prompt = prompt_template + "\n\n" + \
-        f"HTML Content:\n{context['html']}\n\nCSS Files:\n{', '.join(context['css_links'])}\n"
+    # Construct the prompt, collecting pieces so the large HTML string is
+    # copied only once by the final join
+    pieces = [
+        _PROMPT_PREFIX,
+        context['html'],
+        "\n\nCSS Files:\n",
+        ', '.join(context['css_links']),
+        "\n",
+    ]
     if 'images' in context:
-        prompt += f"\nImages:\n{', '.join(context['images'])}\n"
-    if 'screenshot_base64' in context:
-        prompt += "\nA screenshot of the website is also provided for reference.\n"
-
-    prompt += """
-Please generate a clean, modern HTML clone of this website. Focus on:
-1. Maintaining the same visual structure and layout
-2. Using modern HTML5 semantic elements
-3. Implementing responsive design
-4. Optimizing for performance
-5. Following accessibility best practices
-
-Remember: Return ONLY the HTML code, starting with <!DOCTYPE html>. Do not include any explanations or markdown formatting."""
-
-    # Prepare request payload
-    data = {
+        pieces += ["\nImages:\n", ', '.join(context['images']), "\n"]
+    if 'screenshot' in context:
+        pieces.append(
+            "\nA screenshot of the website is also provided for reference.\n")
+    pieces.append(_PROMPT_SUFFIX)
+    prompt = "".join(pieces)
+
+    # Serialize the request payload straight to bytes
+    data = orjson.dumps({
         "contents": [
             {
                 "parts": [
@@ -91,28 +122,31 @@ Remember: Return ONLY the HTML code, starting with <!DOCTYPE html>. Do not inclu
                 ]
             }
         ]
-    }
+    })
 
     try:
         logger.info("Sending request to Gemini API...")
-        response = requests.post(
-            endpoint,
-            headers={"Content-Type": "application/json"},
-            json=data,
-            timeout=60  # 60 second timeout
-        )
+        async with _gemini_sem:
+            response = await _client.post(
+                _ENDPOINT,
+                headers={"Content-Type": "application/json"},
+                content=data
+            )
 
         # Log response details if request fails
-        if not response.ok:
+        if not response.is_success:
             logger.error(
                 f"Gemini API request failed with status {response.status_code}")
             logger.error(f"Response text: {response.text}")
             response.raise_for_status()
 
-        result = response.json()
+        # Parse straight from the response bytes
+        result = orjson.loads(response.content)
 
         # Log the raw response for debugging
-        logger.debug(f"Raw API response: {json.dumps(result, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Raw API response: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
 
         # Validate response structure
         if not result.get("candidates"):
@@ -139,7 +173,7 @@ Remember: Return ONLY the HTML code, starting with <!DOCTYPE html>. Do not inclu
         logger.info("Successfully generated HTML from Gemini API")
         return generated_text
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request to Gemini API failed: {str(e)}")
         raise
     except (KeyError, IndexError) as e:
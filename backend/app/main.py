@@ -1,22 +1,43 @@
-from app.llm_client import generate_clone_from_context
-from .scraper import scrape_website
+from app.llm_client import generate_clone_from_context, close_client
+from .clone_template import generate_clone_from_template
+from .scraper import scrape_website, SCREENSHOT_MEDIA_TYPE
 import asyncio
 import time
-import base64
 import logging
+import hashlib
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, HttpUrl
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi import FastAPI, HTTPException
-import requests
-print("Requests imported successfully!")
+from fastapi.responses import ORJSONResponse, Response
+from playwright.async_api import Browser, async_playwright
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Chromium instance is shared by all requests; each scrape only
+    # opens a lightweight browser context on it
+    app.state.playwright = await async_playwright().start()
+    app.state.browser = await app.state.playwright.chromium.launch(
+        headless=True)
+    logger.info("Playwright browser launched")
+    try:
+        yield
+    finally:
+        await app.state.browser.close()
+        await app.state.playwright.stop()
+        await close_client()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -28,6 +49,104 @@ app.add_middleware(
 )
 
 
+class _SelectiveGZipMiddleware:
+    """GZipMiddleware that passes through paths serving already-compressed
+    bodies (JPEG screenshots) instead of spending CPU re-compressing them."""
+
+    def __init__(self, app, exclude_prefixes: tuple[str, ...] = (), **kwargs):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **kwargs)
+        self.exclude_prefixes = exclude_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(
+                self.exclude_prefixes):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Compress the large HTML/JSON payloads returned by /scrape and /clone
+app.add_middleware(_SelectiveGZipMiddleware,
+                   exclude_prefixes=("/scrape/screenshot/",),
+                   minimum_size=1024, compresslevel=5)
+
+
+_browser_lock = asyncio.Lock()
+
+
+async def _get_browser() -> Browser:
+    """Return the shared browser, relaunching it if Chromium has gone away."""
+    if app.state.browser.is_connected():
+        return app.state.browser
+    async with _browser_lock:
+        # Another request may have relaunched it while we waited
+        if not app.state.browser.is_connected():
+            logger.warning("Playwright browser disconnected, relaunching")
+            app.state.browser = await app.state.playwright.chromium.launch(
+                headless=True)
+    return app.state.browser
+
+
+# Screenshots are served from a sibling endpoint instead of being
+# base64-embedded in the /scrape JSON. The store is bounded by total bytes
+# and entries expire after SCREENSHOT_TTL.
+SCREENSHOT_TTL = 300.0  # seconds
+SCREENSHOT_CACHE_BYTES = 64 * 1024 * 1024
+_screenshots: TTLCache = TTLCache(maxsize=SCREENSHOT_CACHE_BYTES,
+                                  ttl=SCREENSHOT_TTL, getsizeof=len)
+
+
+def _store_screenshot(data: bytes) -> Optional[str]:
+    # Content-addressed, so re-serving a cached scrape reuses the same entry
+    screenshot_id = hashlib.blake2b(data, digest_size=16).hexdigest()
+    try:
+        _screenshots[screenshot_id] = data
+    except ValueError:
+        logger.warning(
+            f"Screenshot of {len(data)} bytes exceeds the screenshot store size")
+        return None
+    return screenshot_id
+
+
+# Scrape and clone results keyed by target URL. Cache reads and writes
+# never await, so they are atomic on the event loop and need no lock.
+# Scrape results carry the full HTML and screenshot, so that cache is
+# bounded by bytes rather than entry count.
+CACHE_TTL = 300.0  # seconds
+SCRAPE_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def _scrape_result_size(result: Dict[str, Any]) -> int:
+    return (len(result['html']) + len(result.get('screenshot') or b'')
+            + sum(map(len, result['inline_styles']))
+            + sum(map(len, result['scripts'])))
+
+
+_scrape_cache: TTLCache = TTLCache(maxsize=SCRAPE_CACHE_BYTES, ttl=CACHE_TTL,
+                                   getsizeof=_scrape_result_size)
+_clone_cache: TTLCache = TTLCache(maxsize=256, ttl=CACHE_TTL)
+
+
+async def _scrape_cached(url: str, nocache: bool = False,
+                         include_styles: bool = False,
+                         include_scripts: bool = False,
+                         block_assets: bool = False) -> Dict[str, Any]:
+    key = (url, include_styles, include_scripts, block_assets)
+    if not nocache:
+        result = _scrape_cache.get(key)
+        if result is not None:
+            logger.info(f"Scrape cache hit for URL: {url}")
+            return result
+    result = await scrape_website(url, await _get_browser(), include_styles,
+                                  include_scripts, block_assets)
+    try:
+        _scrape_cache[key] = result
+    except ValueError:
+        logger.warning(f"Scrape result for {url} is too large to cache")
+    return result
+
+
 class ScrapeRequest(BaseModel):
     target_url: HttpUrl
 
@@ -39,21 +158,27 @@ class ScrapeResponse(BaseModel):
     html: str
     css_links: list[str]
     images: list[str]
-    screenshot: Optional[str] = None  # Base64 encoded if present
-    inline_styles: list[str] = []
-    scripts: list[str] = []
+    screenshot_id: Optional[str] = None  # Fetch via /scrape/screenshot/{id}
+    inline_styles: list[str] = []  # Only with ?include_styles=1
+    scripts: list[str] = []  # Only with ?include_scripts=1
     meta_tags: list[dict] = []
     processing_time: float  # Time taken to process the request
 
 
-@app.post("/scrape", response_model=ScrapeResponse)
-async def scrape_endpoint(request: ScrapeRequest):
+@app.post("/scrape", response_model=None,
+          responses={200: {"model": ScrapeResponse}})
+async def scrape_endpoint(request: ScrapeRequest, nocache: bool = False,
+                          include_styles: bool = False,
+                          include_scripts: bool = False,
+                          block_assets: bool = False):
     start_time = time.time()
     try:
         logger.info(f"Received scrape request for URL: {request.target_url}")
         try:
             result = await asyncio.wait_for(
-                scrape_website(str(request.target_url)),
+                _scrape_cached(str(request.target_url), nocache,
+                               include_styles, include_scripts,
+                               block_assets),
                 timeout=15.0  # 15 second timeout for the entire operation
             )
         except asyncio.TimeoutError:
@@ -65,28 +190,27 @@ async def scrape_endpoint(request: ScrapeRequest):
                 detail="Scraping operation timed out"
             )
 
-        # Convert screenshot to base64 if present
-        screenshot_base64 = None
+        # Keep the raw screenshot bytes server-side and return a handle
+        screenshot_id = None
         if result.get('screenshot'):
-            logger.info("Converting screenshot to base64")
-            screenshot_base64 = base64.b64encode(
-                result['screenshot']).decode('utf-8')
+            screenshot_id = _store_screenshot(result['screenshot'])
 
         elapsed = time.time() - start_time
         logger.info(f"Total request processing time: {elapsed:.2f} seconds")
-        return ScrapeResponse(
-            status="success",
-            url=str(request.target_url),
-            scraper_used=result.get('scraper_used', 'playwright'),
-            html=result.get('html', ''),
-            css_links=result.get('css_links', []),
-            images=result.get('images', []),
-            screenshot=screenshot_base64,
-            inline_styles=result.get('inline_styles', []),
-            scripts=result.get('scripts', []),
-            meta_tags=result.get('meta_tags', []),
-            processing_time=elapsed
-        )
+        # Build the payload directly so large strings skip jsonable_encoder
+        return ORJSONResponse(content={
+            'status': "success",
+            'url': str(request.target_url),
+            'scraper_used': result.get('scraper_used', 'playwright'),
+            'html': result.get('html', ''),
+            'css_links': result.get('css_links', []),
+            'images': result.get('images', []),
+            'screenshot_id': screenshot_id,
+            'inline_styles': result.get('inline_styles', []),
+            'scripts': result.get('scripts', []),
+            'meta_tags': result.get('meta_tags', []),
+            'processing_time': elapsed
+        }, status_code=200)
     except Exception as e:
         logger.error(f"Error in /scrape endpoint: {str(e)}")
         raise HTTPException(
@@ -95,6 +219,17 @@ async def scrape_endpoint(request: ScrapeRequest):
         )
 
 
+@app.get("/scrape/screenshot/{screenshot_id}")
+async def screenshot_endpoint(screenshot_id: str):
+    data = _screenshots.get(screenshot_id)
+    if data is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Screenshot not found or expired"
+        )
+    return Response(content=data, media_type=SCREENSHOT_MEDIA_TYPE)
+
+
 class CloneRequest(BaseModel):
     target_url: HttpUrl
 
@@ -103,14 +238,23 @@ class CloneResponse(BaseModel):
     cloned_html: str
 
 
-@app.post("/clone", response_model=CloneResponse)
-async def clone_endpoint(request: CloneRequest):
+@app.post("/clone", response_model=None,
+          responses={200: {"model": CloneResponse}})
+async def clone_endpoint(request: CloneRequest, nocache: bool = False):
     try:
         logger.info(f"Received clone request for URL: {request.target_url}")
-        # Scrape the website using Playwright
+        url = str(request.target_url)
+        cached_html = None if nocache else _clone_cache.get(url)
+        if cached_html is not None:
+            logger.info(f"Clone cache hit for URL: {url}")
+            return ORJSONResponse(content={'cloned_html': cached_html},
+                                  status_code=200)
+
+        # Scrape the website using Playwright. The screenshot is never
+        # rendered for the user here, so images and fonts are skipped
         try:
             scrape_result = await asyncio.wait_for(
-                scrape_website(str(request.target_url)),
+                _scrape_cached(url, nocache, block_assets=True),
                 timeout=15.0
             )
         except asyncio.TimeoutError:
@@ -122,18 +266,23 @@ async def clone_endpoint(request: CloneRequest):
 
         # Prepare context for the LLM
         context = {
+            'url': url,
             'html': scrape_result['html'],
             'css_links': scrape_result['css_links'],
             'images': scrape_result['images'],
         }
-        # Add screenshot if present
-        if scrape_result.get('screenshot'):
-            context['screenshot_base64'] = base64.b64encode(
-                scrape_result['screenshot']).decode('utf-8')
 
         # Generate the clone
         try:
-            cloned_html = generate_clone_from_context(context)
+            # Trivial static pages skip the LLM entirely
+            cloned_html = generate_clone_from_template(context)
+            if cloned_html is not None:
+                logger.info("Trivial page, cloned from template")
+            else:
+                # Add screenshot if present, as raw bytes
+                if scrape_result.get('screenshot'):
+                    context['screenshot'] = scrape_result['screenshot']
+                cloned_html = await generate_clone_from_context(context)
             if not cloned_html or not cloned_html.strip():
                 raise ValueError("Generated HTML is empty")
         except Exception as e:
@@ -142,7 +291,9 @@ async def clone_endpoint(request: CloneRequest):
                 status_code=500,
                 detail=f"Failed to generate clone: {str(e)}"
             )
-        return CloneResponse(cloned_html=cloned_html)
+        _clone_cache[url] = cloned_html
+        return ORJSONResponse(content={'cloned_html': cloned_html},
+                              status_code=200)
     except Exception as e:
         logger.error(f"Error in /clone endpoint: {str(e)}")
         raise HTTPException(
@@ -153,4 +304,7 @@ async def clone_endpoint(request: CloneRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop event loop and httptools parser (both C extensions). Kept to a
+    # single worker: the browser, caches and screenshot store are per-process
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop",
+                http="httptools")
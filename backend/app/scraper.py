@@ -1,9 +1,9 @@
 from typing import Dict
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from lxml import html as lxml_html
+from urllib.parse import urljoin, urlsplit
 import logging
 import time
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, Route, TimeoutError as PlaywrightTimeoutError
 import asyncio
 
 # Configure more detailed logging
@@ -14,56 +14,117 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def scrape_with_playwright(url: str) -> Dict[str, any]:
+# Screenshots are JPEG, which is several times smaller than PNG for
+# full-page captures; the scraped pages have no need for transparency
+SCREENSHOT_MEDIA_TYPE = "image/jpeg"
+SCREENSHOT_QUALITY = 80
+
+# Resource types that are not needed for the HTML, CSS or layout and are
+# aborted before download when block_assets is set. When block_assets is
+# set, screenshots render without images or web fonts.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+
+async def _block_heavy_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _extract(html: str, url: str, include_styles: bool = False,
+             include_scripts: bool = False) -> Dict[str, any]:
+    """
+    Extract CSS links, images, meta tags and, when requested, inline styles
+    and scripts from html.
+    Runs synchronously; callers on the event loop should use asyncio.to_thread.
+    """
+    # Absolute and protocol-relative references are resolved with string ops;
+    # only genuinely relative ones pay for a full urljoin
+    scheme = urlsplit(url).scheme
+
+    def absolute(ref: str) -> str:
+        if ref.startswith(('http://', 'https://')):
+            return ref
+        if ref.startswith('//'):
+            return f"{scheme}:{ref}"
+        return urljoin(url, ref)
+
+    # Single pass over the parsed tree
+    tree = lxml_html.document_fromstring(html)
+    css_links = []
+    images = []
+    inline_styles = []
+    scripts = []
+    meta_tags = []
+    # <style>/<script> bodies can be large and are unused by the clone
+    # prompt, so they are only visited when asked for
+    tags = ['link', 'img', 'meta']
+    if include_styles:
+        tags.append('style')
+    if include_scripts:
+        tags.append('script')
+    for el in tree.iter(*tags):
+        tag = el.tag
+        if tag == 'link':
+            href = el.get('href')
+            if href and 'stylesheet' in el.get('rel', '').lower().split():
+                css_links.append(absolute(href))
+        elif tag == 'img':
+            src = el.get('src')
+            if src:
+                images.append(absolute(src))
+        elif tag == 'style':
+            inline_styles.append(el.text_content())
+        elif tag == 'script':
+            scripts.append(el.text_content())
+        elif tag == 'meta':
+            meta_tags.append(dict(el.attrib))
+    return {
+        'css_links': css_links,
+        'images': images,
+        'inline_styles': inline_styles,
+        'scripts': scripts,
+        'meta_tags': meta_tags,
+    }
+
+
+async def scrape_with_playwright(url: str, browser: Browser,
+                                 include_styles: bool = False,
+                                 include_scripts: bool = False,
+                                 block_assets: bool = False) -> Dict[str, any]:
     """
     Scrape a website using Playwright (headless browser).
     Extract HTML, CSS links, images, inline styles, scripts, meta tags, and screenshot.
+    A fresh browser context is opened on the shared browser for each call.
     """
     start_time = time.time()
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            if block_assets:
+                await page.route("**/*", _block_heavy_resources)
             logger.debug(f"Navigating to {url} with Playwright")
             await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-            html = await page.content()
-            screenshot_bytes = await page.screenshot(full_page=True)
-            await browser.close()
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Extract CSS links
-        css_links = []
-        for link in soup.find_all('link', rel='stylesheet'):
-            href = link.get('href')
-            if href:
-                css_links.append(urljoin(url, href))
-
-        # Extract image sources
-        images = []
-        for img in soup.find_all('img'):
-            src = img.get('src')
-            if src:
-                images.append(urljoin(url, src))
-
-        # Extract inline <style> tags
-        inline_styles = [style.get_text() for style in soup.find_all('style')]
-
-        # Extract <script> tags
-        scripts = [script.get_text() for script in soup.find_all('script')]
+            # Issue both CDP commands concurrently
+            html, screenshot_bytes = await asyncio.gather(
+                page.content(),
+                page.screenshot(full_page=True, type="jpeg",
+                                quality=SCREENSHOT_QUALITY)
+            )
+        finally:
+            await context.close()
 
-        # Extract meta tags
-        meta_tags = [dict(meta.attrs) for meta in soup.find_all('meta')]
+        # Parsing is CPU-bound, so keep it off the event loop
+        extracted = await asyncio.to_thread(
+            _extract, html, url, include_styles, include_scripts)
 
         elapsed = time.time() - start_time
         logger.debug(f"Playwright scrape completed in {elapsed:.2f} seconds")
         return {
             'html': html,
-            'css_links': css_links,
-            'images': images,
-            'inline_styles': inline_styles,
-            'scripts': scripts,
-            'meta_tags': meta_tags,
+            **extracted,
             'screenshot': screenshot_bytes,
             'scraper_used': 'playwright'
         }
@@ -77,12 +138,20 @@ async def scrape_with_playwright(url: str) -> Dict[str, any]:
         raise
 
 
-async def scrape_website(url: str) -> Dict[str, any]:
+async def scrape_website(url: str, browser: Browser,
+                         include_styles: bool = False,
+                         include_scripts: bool = False,
+                         block_assets: bool = False) -> Dict[str, any]:
     """
     Scrape a website using Playwright for all content and screenshot.
     Args:
         url (str): The URL to scrape
+        browser (Browser): Shared Playwright browser to open the page in
+        include_styles (bool): Also collect inline <style> contents
+        include_scripts (bool): Also collect <script> contents
+        block_assets (bool): Skip downloading images, media and fonts
     Returns:
         Dict containing html, css_links, images, etc.
     """
-    return await scrape_with_playwright(url)
+    return await scrape_with_playwright(url, browser, include_styles,
+                                        include_scripts, block_assets)